@@ -1,11 +1,9 @@
 import ollama
 
 def main():
+    # Truncate to first 12,000 characters (roughly 3K tokens); only that much is read
     with open("full_context.txt", "r") as f:
-        full_context = f.read()
-
-    # Truncate to first 12,000 characters (roughly 3K tokens)
-    truncated_context = full_context[:12000]
+        truncated_context = f.read(12000)
 
     print("❓ Enter your question: ", end="")
     question = input()
@@ -1,4 +1,6 @@
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import fitz  # PyMuPDF
 import traceback
@@ -9,6 +11,8 @@ OUTPUT_DIRS = [
     BASE_DIR / "output",
 ]
 CONTEXT_FILE = BASE_DIR / "full_context.txt"
+WRITE_BUFFER_SIZE = 1 << 20
+EXTRACT_WINDOW = 64  # documents in flight at once; bounds the text waiting in memory
 
 def extract_text_from_pdf(path):
     try:
@@ -28,22 +32,47 @@ def extract_text(path):
         print(f"⚠️ Failed to read text file: {path}")
         return ""
 
+def iter_extracted(executor, file_paths):
+    """Yields (path, text) in order, with at most EXTRACT_WINDOW documents in flight."""
+    def resolve(file_path, future):
+        return file_path, future.result() if future else extract_text(file_path)
+
+    pending = deque()
+    for file_path in file_paths:
+        # Only PDFs need a worker; plain text would just be pickled back through IPC
+        future = executor.submit(extract_text_from_pdf, file_path) if file_path.suffix.lower() == ".pdf" else None
+        pending.append((file_path, future))
+        if len(pending) >= EXTRACT_WINDOW:
+            yield resolve(*pending.popleft())
+    while pending:
+        yield resolve(*pending.popleft())
+
 def main():
-    all_text = []
+    file_paths = [
+        file_path
+        for directory in OUTPUT_DIRS
+        for file_path in directory.rglob("*")
+        if file_path.suffix.lower() in [".txt", ".pdf"]
+    ]
 
-    for directory in OUTPUT_DIRS:
-        for file_path in directory.rglob("*"):
-            if file_path.suffix.lower() in [".txt", ".pdf"]:
+    # Stream each document straight to disk instead of joining the corpus in RAM
+    word_count = 0
+    written = 0
+    with CONTEXT_FILE.open("w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as out:
+        # PDF extraction is CPU-bound, so spread it across processes
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for file_path, content in iter_extracted(executor, file_paths):
                 print(f"📄 Adding: {file_path}")
-                content = extract_text(file_path)
                 if content.strip():
-                    header = f"\n\n### Source: {file_path.name}\n"
-                    all_text.append(header + content.strip())
+                    section = f"\n\n### Source: {file_path.name}\n" + content.strip()
+                    if written:
+                        out.write("\n")
+                    out.write(section)
+                    word_count += len(section.split())
+                    written += 1
 
-    full_text = "\n".join(all_text)
-    CONTEXT_FILE.write_text(full_text, encoding="utf-8")
     print(f"\n✅ Full context written to: {CONTEXT_FILE}")
-    print(f"📝 Total words: {len(full_text.split())}")
+    print(f"📝 Total words: {word_count}")
 
 if __name__ == "__main__":
     main()
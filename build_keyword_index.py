@@ -1,11 +1,15 @@
 from whoosh.fields import Schema, TEXT, ID
 from whoosh import index
 from pathlib import Path
+import mmap
 import os
+import re
 
 # Setup paths
 index_dir = "keyword_index"
 context_file = "full_context.txt"
+writer_limit_mb = 256  # per writer process
+writer_procs = max(1, (os.cpu_count() or 1) - 1)  # leaves a core for the feeding process
 
 # Define schema
 schema = Schema(
@@ -13,26 +17,43 @@ schema = Schema(
     content=TEXT(stored=True)
 )
 
-# Create index directory
-Path(index_dir).mkdir(exist_ok=True)
-
-if not index.exists_in(index_dir):
+def iter_paragraphs(mm):
+    # Break into basic pseudo-documents by blank lines (or use smarter segmentation later),
+    # decoding one slice of the mapping at a time
+    start = 0
+    for match in re.finditer(rb"\r?\n\r?\n", mm):  # also splits CRLF files
+        yield mm[start:match.start()].decode("utf-8", "ignore")
+        start = match.end()
+    yield mm[start:].decode("utf-8", "ignore")
+
+def build_keyword_index():
+    # Create index directory (always a fresh build)
+    Path(index_dir).mkdir(exist_ok=True)
     ix = index.create_in(index_dir, schema)
-else:
-    ix = index.open_dir(index_dir)
-
-# Load context
-with open(context_file, "r", encoding="utf-8") as f:
-    full_text = f.read()
-
-# Break into basic pseudo-documents by keyword sections or line count
-chunks = full_text.split("\n\n")  # or use smarter segmentation later
-
-# Index documents
-writer = ix.writer()
-for i, chunk in enumerate(chunks):
-    if chunk.strip():
-        writer.update_document(title=f"doc_{i}", content=chunk.strip())
-writer.commit()
 
-print(f"✅ Indexed {len(chunks)} keyword chunks into {index_dir}")
+    # Index documents; the index is new, so plain adds skip update_document's delete lookups
+    writer = ix.writer(limitmb=writer_limit_mb, procs=writer_procs, multisegment=True)
+    chunk_count = 0
+    duplicate_count = 0
+    seen = set()  # hashes of paragraphs already indexed (headers, boilerplate, copied text)
+    if os.path.getsize(context_file) > 0:  # an empty file can't be mapped
+        with open(context_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for i, chunk in enumerate(iter_paragraphs(mm)):
+                chunk_count += 1
+                chunk = chunk.strip()
+                if not chunk:
+                    continue
+                key = hash(chunk)
+                if key in seen:
+                    duplicate_count += 1
+                    continue
+                seen.add(key)
+                writer.add_document(title=f"doc_{i}", content=chunk)
+    writer.commit(optimize=False)
+    ix.optimize()
+
+    print(f"✅ Indexed {chunk_count} keyword chunks into {index_dir} ({duplicate_count} duplicates skipped)")
+
+# Guarded so the writer's worker processes don't re-run the build on import
+if __name__ == "__main__":
+    build_keyword_index()
@@ -1,3 +1,7 @@
+import re
+
+WORD_RE = re.compile(r"\S+")
+
 def extract_text(file_path):
     if file_path.endswith(".pdf"):
         with fitz.open(file_path) as doc:
@@ -8,11 +12,17 @@ def extract_text(file_path):
     return None
 
 def chunk_text(text, chunk_size=500, overlap=100):
-    words = text.split()
+    # Record word boundaries once and slice the original string per window,
+    # rather than splitting into a word list and re-joining every chunk
+    starts = []
+    ends = []
+    for match in WORD_RE.finditer(text):
+        starts.append(match.start())
+        ends.append(match.end())
+
     chunks = []
-    for i in range(0, len(words), chunk_size - overlap):
-        chunk = " ".join(words[i:i + chunk_size])
-        if chunk:
-            chunks.append(chunk)
+    for i in range(0, len(starts), chunk_size - overlap):
+        last = min(i + chunk_size, len(ends)) - 1
+        chunks.append(text[starts[i]:ends[last]])
     return chunks
 
@@ -7,7 +7,7 @@ collection = get_competitor_collection(client)
 
 print(f"📊 Document count: {collection.count()}")
 
-docs = collection.get(limit=5)
+docs = collection.get(limit=5, include=["documents"])  # metadata and embeddings aren't previewed
 documents = docs.get("documents", [])
 
 if not documents:
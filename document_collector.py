@@ -0,0 +1,48 @@
+# document_collector.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+READ_WORKERS = 32
+READ_BATCH_SIZE = 256
+
+def read_document(full_path):
+    with open(full_path, "r", encoding="utf-8") as f:
+        return f.read().strip()
+
+def iter_document_entries(base_dir, extensions):
+    """Yields (company, DirEntry) for every matching file under a company folder."""
+    stack = [(os.fspath(base_dir), None)]
+    while stack:
+        dirpath, company = stack.pop()
+        try:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, company or entry.name))
+                    elif company and entry.name.endswith(extensions):
+                        yield company, entry
+        except OSError as e:
+            print(f"⚠️ Could not scan {dirpath}: {e}")
+
+def collect_documents_from_directory(base_dir, extensions):
+    """Yields (company, path, text) for each document under base_dir, in path order."""
+    # Sorting gives a stable order and keeps each company's documents contiguous
+    found = sorted(
+        iter_document_entries(base_dir, extensions),
+        key=lambda item: item[1].path,
+    )
+
+    # Reads are I/O-bound, so overlap them on a thread pool. Documents are
+    # yielded a batch at a time so the whole corpus is never held in memory.
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+        for batch_start in range(0, len(found), READ_BATCH_SIZE):
+            batch = found[batch_start:batch_start + READ_BATCH_SIZE]
+            futures = [executor.submit(read_document, entry.path) for _, entry in batch]
+            for (company, entry), future in zip(batch, futures):
+                full_path = entry.path
+                try:
+                    text = future.result()
+                except Exception as e:
+                    print(f"⚠️ Could not read {full_path}: {e}")
+                    continue
+                yield company, full_path, text
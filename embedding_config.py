@@ -1,9 +1,99 @@
 # embedding_config.py
+import hashlib
+import sqlite3
+import struct
+import threading
+from functools import lru_cache
+from pathlib import Path
+from chromadb.utils.embedding_functions import EmbeddingFunction
 from ollama_embed import OllamaEmbeddingFunction
 
+EMBEDDING_CACHE_FILE = Path(__file__).resolve().parent / "embedding_cache.sqlite3"
+SQLITE_MAX_PARAMS = 500  # stays under SQLite's bound-parameter limit
+CACHE_DTYPES = {"fp16": "e", "fp32": "f"}  # struct codes for the stored vector blobs
+CACHE_LAYOUT_VERSION = 1  # bump whenever the key or blob format changes
+
+class CachedEmbeddingFunction(EmbeddingFunction):
+    """Serves previously embedded texts from an on-disk cache and only embeds the misses."""
+
+    def __init__(self, inner, cache_file=EMBEDDING_CACHE_FILE, dtype="fp16"):
+        self.inner = inner
+        self.model = inner.model
+        # fp16 halves the cache size; pass dtype="fp32" for bit-exact vectors
+        self.dtype = dtype
+        self.code = CACHE_DTYPES[dtype]
+        self.itemsize = struct.calcsize(self.code)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(cache_file), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != CACHE_LAYOUT_VERSION:
+            # Rows in an older layout can never be looked up again, so start empty
+            self.db.execute("DROP TABLE IF EXISTS embeddings")
+            self.db.execute("DROP TABLE IF EXISTS emb")
+            self.db.execute(f"PRAGMA user_version = {CACHE_LAYOUT_VERSION}")
+        self.db.execute("CREATE TABLE IF NOT EXISTS emb (key BLOB PRIMARY KEY, vec BLOB)")
+        self.db.commit()
+
+    def _key(self, text):
+        return hashlib.sha256(f"{self.model}\x00{self.dtype}\x00{text}".encode("utf-8")).digest()
+
+    def _pack(self, vector):
+        try:
+            return struct.pack(f"<{len(vector)}{self.code}", *vector)
+        except (OverflowError, struct.error):
+            return None  # a value outside the fp16 range; leave this one uncached
+
+    def _unpack(self, blob):
+        return list(struct.unpack(f"<{len(blob) // self.itemsize}{self.code}", blob))
+
+    def _lookup(self, keys):
+        found = {}
+        with self.lock:
+            for start in range(0, len(keys), SQLITE_MAX_PARAMS):
+                batch = keys[start:start + SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                found.update(self.db.execute(
+                    f"SELECT key, vec FROM emb WHERE key IN ({placeholders})", batch
+                ))
+        return found
+
+    def __call__(self, input):
+        if not isinstance(input, list):
+            input = [input]
+
+        keys = [self._key(text) for text in input]
+        found = self._lookup(keys)
+
+        embeddings = [None] * len(input)
+        misses = []
+        for i, key in enumerate(keys):
+            if key in found:
+                embeddings[i] = self._unpack(found[key])
+            else:
+                misses.append(i)
+
+        if misses:
+            vectors = self.inner([input[i] for i in misses])
+            rows = []
+            for i, vector in zip(misses, vectors):
+                packed = self._pack(vector)
+                if packed is None:
+                    embeddings[i] = vector  # never cached, so always served at full precision
+                    continue
+                # Return the stored precision so a hit and a miss give identical vectors
+                embeddings[i] = self._unpack(packed)
+                rows.append((keys[i], packed))
+            with self.lock:
+                self.db.executemany("INSERT OR REPLACE INTO emb VALUES (?, ?)", rows)
+                self.db.commit()
+
+        return embeddings
+
+@lru_cache(maxsize=1)
 def get_shared_embedding_function():
     # Adjust model name as needed
-    return OllamaEmbeddingFunction(model_name="llama3")
+    return CachedEmbeddingFunction(OllamaEmbeddingFunction(model_name="llama3"))
 
 def get_competitor_collection(client):
     return client.get_collection(
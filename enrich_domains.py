@@ -1,8 +1,10 @@
 import socket
 import ssl
 import csv
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
+import urllib.request
 from datetime import datetime
-import whois
 
 # Seed domain list
 seed_domains = [
@@ -10,6 +12,14 @@ seed_domains = [
     "fritos.com", "tropicana.com", "quakeroats.com", "gatorade.com", "doritos.com"
 ]
 
+MAX_WORKERS = 32
+FIELDNAMES = [
+    "Domain", "Resolved IP", "Reverse DNS", "Cert Expiry", "Cert SANs", "Cert Issuer", "WHOIS Org"
+]
+RDAP_URL = "https://rdap.org/domain/{domain}"
+# Loading the CA store is costly, so build one context and share it across threads
+SSL_CONTEXT = ssl.create_default_context()
+
 # Get IP address
 def resolve_domain(domain):
     try:
@@ -24,12 +34,11 @@ def reverse_dns(ip):
     except:
         return None
 
-# TLS certificate info
-def get_ssl_cert(domain):
+# TLS certificate info; connects to the already-resolved IP (SNI still uses the domain)
+def get_ssl_cert(domain, ip=None):
     try:
-        context = ssl.create_default_context()
-        with socket.create_connection((domain, 443), timeout=3) as sock:
-            with context.wrap_socket(sock, server_hostname=domain) as ssock:
+        with socket.create_connection((ip or domain, 443), timeout=3) as sock:
+            with SSL_CONTEXT.wrap_socket(sock, server_hostname=domain) as ssock:
                 cert = ssock.getpeercert()
                 san = [entry[1] for entry in cert.get('subjectAltName', [])]
                 issuer = ", ".join("=".join(x) for x in cert.get("issuer", [])[0])
@@ -41,24 +50,47 @@ def get_ssl_cert(domain):
     except:
         return {"notAfter": None, "subjectAltName": None, "issuer": None}
 
-# WHOIS org field
+# Registrant org from an RDAP record's vCard entities
+def find_registrant_org(record):
+    for entity in record.get("entities", []):
+        if "registrant" not in entity.get("roles", []):
+            continue
+        vcard = entity.get("vcardArray", [None, []])[1]
+        for kind in ("org", "fn"):
+            for field in vcard:
+                if field[0] == kind and field[3]:
+                    return field[3]
+    return None
+
+def fetch_rdap(url):
+    request = urllib.request.Request(url, headers={"Accept": "application/rdap+json"})
+    with urllib.request.urlopen(request, timeout=3) as response:
+        return json.load(response)
+
+# WHOIS org field, looked up over RDAP (JSON over HTTPS) instead of port-43 WHOIS
 def get_whois_org(domain):
     try:
-        w = whois.whois(domain)
-        return w.org if hasattr(w, "org") else None
+        record = fetch_rdap(RDAP_URL.format(domain=domain))
+        org = find_registrant_org(record)
+        if org:
+            return org
+        # Thin registries (.com/.net) keep registrant details at the registrar
+        for link in record.get("links", []):
+            if link.get("rel") == "related" and link.get("type") == "application/rdap+json":
+                return find_registrant_org(fetch_rdap(link["href"]))
+        return None
     except:
         return None
 
-# Collect enriched results
-rows = []
-for domain in seed_domains:
+# Enrich a single domain
+def enrich_one(domain):
     print(f"Processing: {domain}")
     ip = resolve_domain(domain)
     rdns = reverse_dns(ip) if ip else None
-    cert_info = get_ssl_cert(domain)
+    cert_info = get_ssl_cert(domain, ip)
     whois_org = get_whois_org(domain)
 
-    rows.append({
+    return {
         "Domain": domain,
         "Resolved IP": ip,
         "Reverse DNS": rdns,
@@ -66,15 +98,20 @@ for domain in seed_domains:
         "Cert SANs": cert_info["subjectAltName"],
         "Cert Issuer": cert_info["issuer"],
         "WHOIS Org": whois_org
-    })
+    }
 
-# Write to CSV
+# Enrich domains concurrently (every lookup is a network round trip) and append each
+# row as soon as it completes, so partial results survive a crash mid-run
 timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
 output_file = f"domain_enrichment_{timestamp}.csv"
 with open(output_file, mode="w", newline="", encoding="utf-8") as f:
-    writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+    writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
     writer.writeheader()
-    writer.writerows(rows)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(enrich_one, domain) for domain in seed_domains]
+        for future in as_completed(futures):
+            writer.writerow(future.result())
+            f.flush()
 
 print(f"\n✔️ Enrichment complete. Results saved to: {output_file}")
 
@@ -1,28 +1,74 @@
+import mmap
 import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
 # Directory to search
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))  # current dir
 
 # Regex to catch .get_collection calls (even split across lines)
-GET_COLLECTION_RE = re.compile(r'\.get_collection\s*\(')
+GET_COLLECTION_RE = re.compile(rb'\.get_collection\s*\(')
+
+def iter_py_files(root_dir):
+    # scandir entries carry their file type from the directory read, so no per-entry stat
+    stack = [root_dir]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.py') and entry.is_file():
+                    yield entry.path
+
+def line_at(buf, pos):
+    """Returns (start, end) of the line containing pos, excluding the newline."""
+    start = buf.rfind(b'\n', 0, pos) + 1
+    end = buf.find(b'\n', pos)
+    return start, len(buf) if end == -1 else end
+
+def decode_line(buf, start, end):
+    return buf[start:end].decode('utf-8', 'ignore').rstrip()
+
+def scan_one_file(fpath):
+    """Returns (path, line number, prev, line, next) for each matching line in one file."""
+    if os.path.getsize(fpath) == 0:
+        return []  # an empty file can't be mapped
+
+    # Match against the mapped bytes; only the context lines of a hit are decoded
+    hits = []
+    with open(fpath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        counted_to, line_no, last_line_no = 0, 1, None
+        for match in GET_COLLECTION_RE.finditer(mm):
+            line_no += mm[counted_to:match.start()].count(b'\n')
+            counted_to = match.start()
+            if line_no == last_line_no:
+                continue
+            last_line_no = line_no
+
+            start, end = line_at(mm, match.start())
+            prev_line = next_line = None
+            if start > 0:
+                prev_line = decode_line(mm, *line_at(mm, start - 1))
+            if end + 1 < len(mm):
+                next_line = decode_line(mm, *line_at(mm, end + 1))
+            hits.append((fpath, line_no, prev_line, decode_line(mm, start, end), next_line))
+    return hits
 
 def scan_files(root_dir):
-    for root, _, files in os.walk(root_dir):
-        for fname in files:
-            if fname.endswith('.py'):
-                fpath = os.path.join(root, fname)
-                with open(fpath, encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    for idx, line in enumerate(lines):
-                        if GET_COLLECTION_RE.search(line):
-                            # Print a little context (the line before and after)
-                            print(f"\nFile: {fpath} (Line {idx+1})")
-                            if idx > 0:
-                                print("Prev:", lines[idx-1].strip())
-                            print("Line:", line.strip())
-                            if idx < len(lines)-1:
-                                print("Next:", lines[idx+1].strip())
+    paths = list(iter_py_files(root_dir))
+    # Files are independent, so decode and regex-scan them on every core
+    with ProcessPoolExecutor() as executor:
+        for hits in executor.map(scan_one_file, paths, chunksize=32):
+            for fpath, line_no, prev_line, line, next_line in hits:
+                # Print a little context (the line before and after) in a single write
+                out = [f"\nFile: {fpath} (Line {line_no})"]
+                if prev_line is not None:
+                    out.append(f"Prev: {prev_line}")
+                out.append(f"Line: {line}")
+                if next_line is not None:
+                    out.append(f"Next: {next_line}")
+                sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
     print("Scanning for '.get_collection(' calls...")
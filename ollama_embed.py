@@ -1,25 +1,33 @@
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from chromadb.utils.embedding_functions import EmbeddingFunction
 
 class OllamaEmbeddingFunction(EmbeddingFunction):
-    def __init__(self, model_name="nomic-embed-text", base_url="http://localhost:11434"):
+    def __init__(self, model_name="nomic-embed-text", base_url="http://localhost:11434", max_workers=8):
         self.model = model_name
         self.base_url = base_url
+        self.max_workers = max_workers
+        # Keep-alive connections shared by every request from this instance
+        self.session = requests.Session()
+
+    def _embed_one(self, text):
+        response = self.session.post(
+            f"{self.base_url}/api/embeddings",
+            json={"model": self.model, "prompt": text}
+        )
+        data = response.json()
+        if "embedding" not in data:
+            raise Exception(f"Embedding failed: {data}")
+        return data["embedding"]
 
     def __call__(self, input):
         # Ensure input is a list of strings
         if not isinstance(input, list):
             input = [input]
 
-        embeddings = []
-        for text in input:
-            response = requests.post(
-                f"{self.base_url}/api/embeddings",
-                json={"model": self.model, "prompt": text}
-            )
-            data = response.json()
-            if "embedding" not in data:
-                raise Exception(f"Embedding failed: {data}")
-            embeddings.append(data["embedding"])
+        if len(input) <= 1:
+            return [self._embed_one(text) for text in input]
 
-        return embeddings
+        # Overlap the per-text round trips instead of waiting on each in turn
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(input))) as executor:
+            return list(executor.map(self._embed_one, input))
@@ -1,11 +1,19 @@
-youg10! > import os
+import atexit
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import zip_longest
 from pathlib import Path
 import chromadb
 from chromadb.config import Settings
 from whoosh.index import open_dir
 from whoosh.qparser import QueryParser
 from embedding_config import get_competitor_collection
-import subprocess
+import requests
 
 # === Configuration ===
 ROOT_DIR = Path(__file__).resolve().parent
@@ -13,6 +21,11 @@ CHROMA_DB_PATH = ROOT_DIR / "chroma_db"
 WHOOSH_INDEX_DIR = ROOT_DIR / "whoosh_index"
 FULL_CONTEXT_FILE = ROOT_DIR / "full_context.txt"
 MODEL_CONFIG_FILE = ROOT_DIR / "config_model.txt"
+SEMANTIC_CACHE_SIZE = 1024
+ANSWER_CACHE_SIZE = 256
+HYBRID_TOP_K = 7  # documents kept after merging semantic and keyword hits
+OLLAMA_URL = "http://localhost:11434"
+OLLAMA_KEEP_ALIVE = "30m"  # keeps the model loaded between questions
 
 # === Load model name dynamically ===
 def get_model_name():
@@ -22,77 +35,241 @@ def get_model_name():
         print(f"⚠️ Could not read model config file: {e}")
         return "llama3"  # fallback default
 
-# === Load vector (semantic) search collection ===
-client = chromadb.PersistentClient(path=str(CHROMA_DB_PATH))
-collection = get_competitor_collection(client)
+# === Vector (semantic) search collection, opened on first use ===
+@lru_cache(maxsize=1)
+def get_collection():
+    client = chromadb.PersistentClient(path=str(CHROMA_DB_PATH))
+    return get_competitor_collection(client)
 
-# === Load Whoosh keyword index ===
-ix = open_dir(str(WHOOSH_INDEX_DIR))
+# === Whoosh keyword index, opened on first use ===
+@lru_cache(maxsize=1)
+def get_keyword_index():
+    return open_dir(str(WHOOSH_INDEX_DIR))
+
+@lru_cache(maxsize=1)
+def get_keyword_parser():
+    return QueryParser("content", get_keyword_index().schema)
+
+keyword_searcher = None  # held open so queries don't reload segments from disk
+keyword_searcher_stamp = None
+keyword_searcher_lock = threading.Lock()
+
+@atexit.register
+def close_keyword_searcher():
+    if keyword_searcher is not None:
+        keyword_searcher.close()
+
+# === Runs the semantic side of hybrid searches next to the keyword side ===
+retrieval_executor = ThreadPoolExecutor(max_workers=4)
+
+# === Persistent HTTP session to the Ollama server ===
+ollama_session = requests.Session()
 
 def query_ollama(prompt: str) -> str:
-    """Calls Ollama using the dynamically selected model."""
+    """Calls Ollama's HTTP API using the dynamically selected model."""
     model = get_model_name()
-    result = subprocess.run(
-        ["ollama", "run", model],
-        input=prompt,
-        capture_output=True,
-        text=True
+    response = ollama_session.post(
+        f"{OLLAMA_URL}/api/generate",
+        json={"model": model, "prompt": prompt, "stream": False, "keep_alive": OLLAMA_KEEP_ALIVE}
     )
-    return result.stdout.strip()
+    data = response.json()
+    if "error" in data:
+        raise Exception(f"Ollama generate failed: {data['error']}")
+    return data.get("response", "").strip()
+
+def stream_ollama(prompt: str):
+    """Yields response tokens from Ollama as they are generated."""
+    model = get_model_name()
+    with ollama_session.post(
+        f"{OLLAMA_URL}/api/generate",
+        json={"model": model, "prompt": prompt, "stream": True, "keep_alive": OLLAMA_KEEP_ALIVE},
+        stream=True
+    ) as response:
+        for line in response.iter_lines():
+            if not line:
+                continue
+            data = json.loads(line)
+            if "error" in data:
+                raise Exception(f"Ollama generate failed: {data['error']}")
+            yield data.get("response", "")
+            if data.get("done"):
+                break
+
+def collection_stamp():
+    """Modification times of Chroma's SQLite files; any ingest, from any process, changes them."""
+    stamp = []
+    for name in ("chroma.sqlite3", "chroma.sqlite3-wal"):
+        try:
+            stamp.append((CHROMA_DB_PATH / name).stat().st_mtime_ns)
+        except FileNotFoundError:
+            stamp.append(None)
+    return tuple(stamp)
+
+@lru_cache(maxsize=SEMANTIC_CACHE_SIZE)
+def _search_semantic_cached(question: str, n_results: int, source_filter, stamp):
+    # stamp only keys the cache, so results from before a re-ingest are never served
+    filters = {"source": {"$in": list(source_filter)}} if source_filter else None
+    results = get_collection().query(query_texts=[question], n_results=n_results, where=filters)
+    return tuple(zip(results["ids"][0], results.get("documents", [[]])[0]))
+
+def search_semantic_hits(question: str, n_results: int = 5, source_filter=None):
+    """Returns (chroma id, document) pairs for the closest chunks."""
+    # Repeated questions skip both the query embedding and the vector search
+    source_filter = tuple(source_filter) if source_filter else None
+    return list(_search_semantic_cached(question.strip(), n_results, source_filter, collection_stamp()))
 
 def search_semantic(question: str, n_results: int = 5, source_filter=None):
-    filters = {"source": {"$in": source_filter}} if source_filter else None
-    results = collection.query(query_texts=[question], n_results=n_results, where=filters)
-    return results.get("documents", [[]])[0]
+    return [doc for _, doc in search_semantic_hits(question, n_results, source_filter)]
+
+def clear_search_cache():
+    """Drops cached semantic results to free memory after a re-ingest (stale ones are already skipped)."""
+    _search_semantic_cached.cache_clear()
+
+def load_indexed_document(path: str) -> str:
+    """Reads a keyword hit's text from disk; the Whoosh index stores only its path relative to ROOT_DIR."""
+    try:
+        # Absolute paths from indexes built before paths were stored relative still resolve as-is
+        return (ROOT_DIR / path).read_text(encoding="utf-8").strip()
+    except Exception as e:
+        print(f"⚠️ Could not read indexed document {path}: {e}")
+        return ""
+
+def keyword_index_stamp():
+    """Names and mtimes of the index's TOC files; changes on every commit, including a full rebuild."""
+    # up_to_date() compares generations, and a create_in rebuild can land on the old one
+    return sorted(
+        (entry.name, entry.stat().st_mtime_ns)
+        for entry in os.scandir(WHOOSH_INDEX_DIR) if entry.name.endswith(".toc")
+    )
+
+def get_keyword_searcher():
+    """Returns the shared Whoosh searcher, reopening it whenever the index changes on disk."""
+    global keyword_searcher, keyword_searcher_stamp
+    stamp = keyword_index_stamp()
+    if keyword_searcher is None or stamp != keyword_searcher_stamp:
+        if keyword_searcher is not None:
+            keyword_searcher.close()
+        keyword_searcher = get_keyword_index().searcher()
+        keyword_searcher_stamp = stamp
+    return keyword_searcher
+
+def search_keyword_hits(question: str, n_results: int = 5, source_filter=None):
+    """Returns (path, document) pairs for the best keyword matches."""
+    query = get_keyword_parser().parse(question)
+    with keyword_searcher_lock:
+        hits = get_keyword_searcher().search(query, limit=n_results)
+        paths = [
+            hit["path"] for hit in hits
+            if not source_filter or hit.get("source", "") in source_filter
+        ]
 
-def search_keyword(question: str, n_results: int = 5, source_filter=None):
     results = []
-    with ix.searcher() as searcher:
-        parser = QueryParser("content", ix.schema)
-        query = parser.parse(question)
-        hits = searcher.search(query, limit=n_results)
-        for hit in hits:
-            if source_filter:
-                source = hit.get("source", "")
-                if source not in source_filter:
-                    continue
-            results.append(hit["content"])
+    for path in paths:
+        content = load_indexed_document(path)
+        if content:
+            results.append((path, content))
     return results
 
-def ask(question: str, mode: str = "semantic", source_filter=None) -> str:
-    """Routes the question through the selected search mode."""
-    try:
-        if mode == "semantic":
-            docs = search_semantic(question, source_filter=source_filter)
-            if not docs:
-                return "No relevant semantic documents found."
-            context = "\n\n".join(docs)
-
-        elif mode == "keyword":
-            docs = search_keyword(question, source_filter=source_filter)
-            if not docs:
-                return "No relevant keyword documents found."
-            context = "\n\n".join(docs)
-
-        elif mode == "hybrid":
-            sem_docs = search_semantic(question, source_filter=source_filter)
-            key_docs = search_keyword(question, source_filter=source_filter)
-            all_docs = list({doc for doc in sem_docs + key_docs if doc})
-            if not all_docs:
-                return "No relevant documents found from either method."
-            context = "\n\n".join(all_docs)
-
-        elif mode == "full":
-            try:
-                context = FULL_CONTEXT_FILE.read_text(encoding="utf-8")
-            except Exception as e:
-                return f"❌ Failed to load full context: {e}"
-
-        else:
-            return "❌ Invalid mode selected."
-
-        # === Format the prompt ===
-        final_prompt = f"""You are a competitive intelligence assistant analyzing cybersecurity vendors.
+def search_keyword(question: str, n_results: int = 5, source_filter=None):
+    return [doc for _, doc in search_keyword_hits(question, n_results, source_filter)]
+
+def interleave_hits(*hit_lists, top_k: int = HYBRID_TOP_K):
+    """Round-robins ranked (id, document) hit lists into at most top_k unique documents."""
+    # Chroma chunk ids and Whoosh paths never coincide, so the same text returned
+    # by both retrievers is caught by an 8-byte fingerprint of the document
+    seen_ids = set()
+    seen_fingerprints = set()
+    merged = []
+    for hits in zip_longest(*hit_lists):
+        for hit in hits:
+            if hit is None:
+                continue
+            doc_id, doc = hit
+            if not doc or doc_id in seen_ids:
+                continue
+            fingerprint = hashlib.blake2b(doc.encode("utf-8"), digest_size=8).digest()
+            if fingerprint in seen_fingerprints:
+                continue
+            seen_ids.add(doc_id)
+            seen_fingerprints.add(fingerprint)
+            merged.append(doc)
+            if len(merged) == top_k:
+                return merged
+    return merged
+
+full_context_cache = {"mtime_ns": None, "text": ""}
+
+def load_full_context() -> str:
+    """Returns full_context.txt, re-reading it only after the file changes on disk."""
+    mtime_ns = FULL_CONTEXT_FILE.stat().st_mtime_ns
+    if mtime_ns != full_context_cache["mtime_ns"]:
+        full_context_cache["text"] = FULL_CONTEXT_FILE.read_text(encoding="utf-8")
+        full_context_cache["mtime_ns"] = mtime_ns
+    return full_context_cache["text"]
+
+# === Answers keyed by (model, prompt digest); the prompt embeds the retrieved context,
+# so a re-ingest or a rebuilt full_context.txt naturally misses ===
+answer_cache = OrderedDict()
+answer_cache_lock = threading.Lock()
+
+def answer_key(prompt: str):
+    # Digest rather than the prompt itself: a "full" mode prompt is all of full_context.txt
+    return get_model_name(), hashlib.sha256(prompt.encode("utf-8")).digest()
+
+def get_cached_answer(key):
+    with answer_cache_lock:
+        answer = answer_cache.get(key)
+        if answer is not None:
+            answer_cache.move_to_end(key)
+        return answer
+
+def cache_answer(key, answer):
+    with answer_cache_lock:
+        answer_cache[key] = answer
+        answer_cache.move_to_end(key)
+        if len(answer_cache) > ANSWER_CACHE_SIZE:
+            answer_cache.popitem(last=False)
+
+def build_prompt(question: str, mode: str = "semantic", source_filter=None):
+    """Routes the question through the selected search mode.
+
+    Returns (prompt, None), or (None, message) when there is nothing to send to the model.
+    """
+    question = " ".join(question.split())  # so re-asked questions hit the caches
+
+    if mode == "semantic":
+        docs = search_semantic(question, source_filter=source_filter)
+        if not docs:
+            return None, "No relevant semantic documents found."
+        context = "\n\n".join(docs)
+
+    elif mode == "keyword":
+        docs = search_keyword(question, source_filter=source_filter)
+        if not docs:
+            return None, "No relevant keyword documents found."
+        context = "\n\n".join(docs)
+
+    elif mode == "hybrid":
+        # Chroma and Whoosh are independent, so query them side by side
+        sem_future = retrieval_executor.submit(search_semantic_hits, question, source_filter=source_filter)
+        key_hits = search_keyword_hits(question, source_filter=source_filter)
+        sem_hits = sem_future.result()
+        all_docs = interleave_hits(sem_hits, key_hits)
+        if not all_docs:
+            return None, "No relevant documents found from either method."
+        context = "\n\n".join(all_docs)
+
+    elif mode == "full":
+        try:
+            context = load_full_context()
+        except Exception as e:
+            return None, f"❌ Failed to load full context: {e}"
+
+    else:
+        return None, "❌ Invalid mode selected."
+
+    # === Format the prompt ===
+    final_prompt = f"""You are a competitive intelligence assistant analyzing cybersecurity vendors.
 
 You will be given a large block of text that includes notes, datasheets, and summaries from various documents.
 
@@ -110,9 +287,43 @@ Important Instructions:
 Answer the following question:
 {question}
 """
-        return query_ollama(final_prompt)
+    return final_prompt, None
+
+def ask(question: str, mode: str = "semantic", source_filter=None) -> str:
+    """Routes the question through the selected search mode."""
+    try:
+        prompt, message = build_prompt(question, mode, source_filter)
+        if prompt is None:
+            return message
+        key = answer_key(prompt)
+        answer = get_cached_answer(key)
+        if answer is None:
+            answer = query_ollama(prompt)
+            if answer:
+                cache_answer(key, answer)
+        return answer
 
     except Exception as e:
         return f"❌ Error during {mode} search: {e}"
-.Gobe1e10200 Fortg10recommendUAE```
-m
\ No newline at end of file
+
+def ask_stream(question: str, mode: str = "semantic", source_filter=None):
+    """Like ask(), but yields the answer as it grows so the UI can show tokens as they arrive."""
+    try:
+        prompt, message = build_prompt(question, mode, source_filter)
+        if prompt is None:
+            yield message
+            return
+        key = answer_key(prompt)
+        answer = get_cached_answer(key)
+        if answer is not None:
+            yield answer
+            return
+        answer = ""
+        for token in stream_ollama(prompt):
+            answer += token
+            yield answer
+        if answer:
+            cache_answer(key, answer)
+
+    except Exception as e:
+        yield f"❌ Error during {mode} search: {e}"
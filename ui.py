@@ -1,11 +1,17 @@
 import gradio as gr
 import subprocess
-from search_engine import ask
+from collections import deque
+from search_engine import ask_stream, clear_search_cache
+
+LOG_TAIL_LINES = 200  # ingest log lines kept in the Data Manager textbox
 
 # === Tab 1: Ask a Question ===
 def ask_and_debug(question, mode):
-    answer = ask(question, mode=mode)
-    return answer, f"✅ Answered using mode: {mode}"
+    # Stream the answer into the textbox as Ollama generates it
+    answer = ""
+    for answer in ask_stream(question, mode=mode):
+        yield answer, f"⏳ Answering using mode: {mode}..."
+    yield answer, f"✅ Answered using mode: {mode}"
 
 with gr.Blocks(title="📊 Local Competitive Intelligence Chat") as iface:
     with gr.Tab("💬 Ask a Question"):
@@ -36,7 +42,7 @@ with gr.Blocks(title="📊 Local Competitive Intelligence Chat") as iface:
             subprocess.run(["python3", "reset_hard.py"])
 
             cmd = [
-                "python3", "ingest_internal_doc.py",
+                "python3", "-u", "ingest_internal_doc.py",  # unbuffered so log lines arrive as printed
                 "--chunk-size", str(chunk_size),
                 "--overlap", str(overlap)
             ]
@@ -45,9 +51,20 @@ with gr.Blocks(title="📊 Local Competitive Intelligence Chat") as iface:
             if limit:
                 cmd += ["--limit", str(int(limit))]
 
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            output = result.stdout or result.stderr or "✅ Done."
-            return f"🔁 Reset + Ingest triggered...\n\n{output}"
+            # Stream the tail of the ingest log instead of buffering it until exit
+            header = "🔁 Reset + Ingest triggered...\n\n"
+            tail = deque(maxlen=LOG_TAIL_LINES)
+            yield header
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True) as proc:
+                for line in proc.stdout:
+                    tail.append(line)
+                    yield header + "".join(tail)
+            clear_search_cache()
+            if proc.returncode == 0:
+                status = "✅ Done."
+            else:
+                status = f"❌ Ingest failed (exit code {proc.returncode})."
+            yield header + "".join(tail) + "\n" + status
 
         gr.Button("🔄 Reset & Reingest All").click(
             reset_and_ingest,
@@ -56,4 +73,4 @@ with gr.Blocks(title="📊 Local Competitive Intelligence Chat") as iface:
         )
 
 if __name__ == "__main__":
-    iface.launch()
+    iface.queue().launch()  # queue is required for streamed (generator) outputs